@@ -1,7 +1,13 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+import json
 import logging
-from query_generator import execute_query, generate_sql_query, explain_sql_query
+from query_generator import (
+    execute_query, generate_sql_query, explain_sql_query, aggregate_query, get_query_columns,
+    stream_query, validate_sql_query, split_sql_statements, MAX_RESULT_ROWS
+)
 from database import list_databases, list_tables, list_columns
 
 # Initialize app
@@ -26,6 +32,17 @@ class QueryRequest(BaseModel):
     query: str
 
 
+class ExecuteRequest(BaseModel):
+    query: str
+    mode: str = "commit"  # commit | dry_run | read_only
+
+
+class AggregateRequest(BaseModel):
+    query: str
+    column: str
+    top_n: int = 10
+
+
 # ==============================
 # ROUTES: SQL GENERATION & EXECUTION
 # ==============================
@@ -43,31 +60,86 @@ async def generate_sql_endpoint(request: QueryRequest):
 
 
 @app.post("/execute_sql/")
-async def execute_sql_endpoint(request: QueryRequest):
-    """Execute user-provided SQL query."""
+async def execute_sql_endpoint(request: ExecuteRequest):
+    """Execute user-provided SQL; multi-statement scripts run in a single transaction."""
     try:
         sql_query = request.query
-        results = execute_query(sql_query, db_config)
+        # Fetch one extra row so we can tell whether the result was cut off
+        results = execute_query(sql_query, db_config, request.mode, max_rows=MAX_RESULT_ROWS + 1)
 
         if results is None:
             raise HTTPException(status_code=500, detail="Error executing query")
 
+        # Scripts and dry runs report a per-statement summary instead of result rows
+        if isinstance(results, dict):
+            for item in results["statements"]:
+                if "rows" in item:
+                    item["truncated"] = item["truncated"] or len(item["rows"]) > MAX_RESULT_ROWS
+                    item["rows"] = item["rows"][:MAX_RESULT_ROWS]
+            return {"results": [], "script": results, "truncated": False}
+
+        truncated = isinstance(results, list) and len(results) > MAX_RESULT_ROWS
         response = {
-            "results": results if isinstance(results, list) else [results],
+            "results": results[:MAX_RESULT_ROWS] if isinstance(results, list) else [results],
+            "truncated": truncated,
             "optimization_tips": "Consider adding indexes on frequently used WHERE or JOIN columns."
         }
         return response
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logging.error(f"Error executing SQL: {e}")
         raise HTTPException(status_code=500, detail=f"Error executing query: {str(e)}")
 
 
+@app.post("/stream_sql/")
+async def stream_sql_endpoint(request: QueryRequest):
+    """Stream every row of a single SELECT as newline-delimited JSON."""
+    sql_query = request.query
+    is_valid, error_msg = validate_sql_query(sql_query)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=error_msg)
+    if len(split_sql_statements(sql_query)) != 1 or not sql_query.strip().lower().startswith("select"):
+        raise HTTPException(status_code=400, detail="Streaming supports a single SELECT statement only.")
+
+    def generate():
+        for batch in stream_query(sql_query, db_config):
+            for row in batch:
+                yield json.dumps(jsonable_encoder(row)) + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+@app.post("/query_columns/")
+async def query_columns_endpoint(request: QueryRequest):
+    """Return the column names of a SELECT without fetching its rows."""
+    try:
+        return {"columns": get_query_columns(request.query, db_config)}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Error probing columns: {e}")
+        raise HTTPException(status_code=500, detail=f"Error probing columns: {str(e)}")
+
+
+@app.post("/aggregate_sql/")
+async def aggregate_sql_endpoint(request: AggregateRequest):
+    """Return top-N value counts for a column of a SELECT query, computed in the database."""
+    try:
+        return aggregate_query(request.query, request.column, db_config, request.top_n)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logging.error(f"Error aggregating SQL: {e}")
+        raise HTTPException(status_code=500, detail=f"Error aggregating query: {str(e)}")
+
+
 # ==============================
 # ROUTES: DATABASE INSPECTION
 # ==============================
 @app.get("/list_databases/")
 async def list_databases_endpoint():
-    """List all databases available on the MySQL server."""
+    """List all databases available on the database server."""
     try:
         databases = list_databases()
         if not databases:
@@ -1,6 +1,7 @@
 import os
 import logging
 from sqlalchemy import create_engine, text
+from sqlalchemy.engine import URL, make_url
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -13,28 +14,164 @@ MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "")
 MYSQL_DATABASE = os.getenv("MYSQL_DATABASE", "")
 MYSQL_PORT = os.getenv("MYSQL_PORT", "3306")
 
+# Dialect selection: a full DATABASE_URL wins, otherwise DB_DIALECT (mysql | sqlite)
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+SQLITE_PATH = os.getenv("SQLITE_PATH", "local.db")
+DB_DIALECT = make_url(DATABASE_URL).get_backend_name() if DATABASE_URL else os.getenv("DB_DIALECT", "mysql").lower()
+
+# Database used for schema introspection and query execution (the URL's own database wins)
+DEFAULT_DATABASE = make_url(DATABASE_URL).database if DATABASE_URL else MYSQL_DATABASE
+
+# Connection pool settings (ignored for SQLite)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 
-def get_engine_for_db(database_name=None):
-    """Create an SQLAlchemy engine for a specific database (or none)."""
-    db_url = (
-        f"mysql+mysqlconnector://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/"
-        f"{database_name if database_name else ''}?auth_plugin=mysql_native_password"
+# Engines are cached per connection URL so every call reuses the same pool
+_engines = {}
+
+# Per-dialect introspection queries; missing entries fall back to the MySQL ones
+INTROSPECTION_QUERIES = {
+    "mysql": {
+        "databases": "SHOW DATABASES;",
+        "tables": "SHOW TABLES;",
+        "columns": """
+            SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table
+            ORDER BY ORDINAL_POSITION;
+        """,
+        "schema": """
+            SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE();
+        """,
+    },
+    "sqlite": {
+        "databases": "SELECT name FROM pragma_database_list;",
+        "tables": "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name;",
+        "columns": "SELECT name FROM pragma_table_info(:table) ORDER BY cid;",
+        "schema": """
+            SELECT m.name, p.name, p.type
+            FROM sqlite_master AS m JOIN pragma_table_info(m.name) AS p
+            WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+            ORDER BY m.name, p.cid;
+        """,
+    },
+    "postgresql": {
+        "databases": "SELECT datname FROM pg_database WHERE NOT datistemplate ORDER BY datname;",
+        "tables": """
+            SELECT table_name FROM information_schema.tables
+            WHERE table_schema = current_schema() ORDER BY table_name;
+        """,
+        "columns": """
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :table
+            ORDER BY ordinal_position;
+        """,
+        "schema": """
+            SELECT table_name, column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = current_schema();
+        """,
+    },
+    "mssql": {
+        "databases": "SELECT name FROM sys.databases ORDER BY name;",
+        "tables": "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_TYPE = 'BASE TABLE' ORDER BY TABLE_NAME;",
+        "columns": """
+            SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_NAME = :table ORDER BY ORDINAL_POSITION;
+        """,
+        "schema": "SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS;",
+    },
+    "snowflake": {
+        "databases": "SELECT DATABASE_NAME FROM INFORMATION_SCHEMA.DATABASES ORDER BY DATABASE_NAME;",
+        "tables": """
+            SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = CURRENT_SCHEMA() ORDER BY TABLE_NAME;
+        """,
+        "columns": """
+            SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = CURRENT_SCHEMA() AND TABLE_NAME = :table
+            ORDER BY ORDINAL_POSITION;
+        """,
+        "schema": """
+            SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = CURRENT_SCHEMA();
+        """,
+    },
+}
+
+
+def _build_url(database_name=None, db_config=None):
+    """
+    Build the connection URL for the active dialect.
+    db_config only describes the MySQL fallback; an explicit DATABASE_URL is used as-is
+    unless a database_name is passed (e.g. from the database explorer).
+    """
+    if DATABASE_URL:
+        url = make_url(DATABASE_URL)
+        if database_name and DB_DIALECT != "sqlite":
+            url = url.set(database=database_name)
+        return url
+
+    if DB_DIALECT == "sqlite":
+        return URL.create("sqlite", database=(db_config or {}).get("path", SQLITE_PATH))
+
+    if DB_DIALECT != "mysql":
+        raise ValueError(f"DB_DIALECT '{DB_DIALECT}' needs a DATABASE_URL; only mysql and sqlite are built from settings.")
+
+    # PyMySQL supports server-side cursors, so stream_results really streams on MySQL
+    config = db_config or {}
+    return URL.create(
+        "mysql+pymysql",
+        username=config.get("user", MYSQL_USER),
+        password=config.get("password", MYSQL_PASSWORD),
+        host=config.get("host", MYSQL_HOST),
+        port=int(config.get("port", MYSQL_PORT)),
+        database=database_name or config.get("database") or None,
     )
+
+
+def get_engine(database_name=None, db_config=None):
+    """Return a pooled SQLAlchemy engine for the active dialect, reusing it across calls."""
+    url = _build_url(database_name, db_config)
+    key = url.render_as_string(hide_password=False)
+    if key in _engines:
+        return _engines[key]
+
+    options = {"pool_pre_ping": True, "echo": False}
+    if DB_DIALECT != "sqlite":
+        options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_recycle=DB_POOL_RECYCLE)
+
     try:
-        engine = create_engine(db_url, pool_pre_ping=True, echo=False)
-        logging.debug(f" Engine created for DB: {database_name or 'no specific DB'}")
+        engine = create_engine(url, **options)
+        _engines[key] = engine
+        logging.debug(f" Engine created for {DB_DIALECT} DB: {database_name or 'no specific DB'}")
         return engine
     except Exception as e:
         logging.error(f" Error creating engine: {e}")
         raise
 
 
+def get_engine_for_db(database_name=None):
+    """Create an SQLAlchemy engine for a specific database (or none)."""
+    return get_engine(database_name)
+
+
+def _introspection_query(name):
+    """Return the introspection SQL for the active dialect."""
+    queries = INTROSPECTION_QUERIES.get(DB_DIALECT, INTROSPECTION_QUERIES["mysql"])
+    return text(queries[name])
+
+
 def test_connection():
     """Check if database connection works."""
     try:
-        with get_engine_for_db(MYSQL_DATABASE).connect() as connection:
+        with get_engine_for_db(DEFAULT_DATABASE).connect() as connection:
             logging.info(" Database connected successfully.")
     except Exception as e:
         logging.error(f" Connection failed: {e}")
@@ -46,7 +183,7 @@ def list_databases():
     try:
         engine = get_engine_for_db()
         with engine.connect() as connection:
-            result = connection.execute(text("SHOW DATABASES;"))
+            result = connection.execute(_introspection_query("databases"))
             databases = [row[0] for row in result.fetchall()]
         return databases
     except Exception as e:
@@ -59,7 +196,7 @@ def list_tables(database_name):
     try:
         engine = get_engine_for_db(database_name)
         with engine.connect() as connection:
-            result = connection.execute(text("SHOW TABLES;"))
+            result = connection.execute(_introspection_query("tables"))
             tables = [row[0] for row in result.fetchall()]
         return tables
     except Exception as e:
@@ -71,9 +208,8 @@ def list_columns(database_name, table_name):
     """Return list of columns for a given table."""
     try:
         engine = get_engine_for_db(database_name)
-        query = text(f"SHOW COLUMNS FROM `{table_name}`;")
         with engine.connect() as connection:
-            result = connection.execute(query)
+            result = connection.execute(_introspection_query("columns"), {"table": table_name})
             columns = [row[0] for row in result.fetchall()]
         return columns
     except Exception as e:
@@ -82,16 +218,11 @@ def list_columns(database_name, table_name):
 
 
 def get_schema():
-    """Return schema (table → [columns]) for current MYSQL_DATABASE."""
+    """Return schema (table → [columns]) for the current database."""
     try:
-        engine = get_engine_for_db(MYSQL_DATABASE)
-        query = text("""
-            SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE
-            FROM INFORMATION_SCHEMA.COLUMNS
-            WHERE TABLE_SCHEMA = :database;
-        """)
+        engine = get_engine_for_db(DEFAULT_DATABASE)
         with engine.connect() as connection:
-            result = connection.execute(query, {"database": MYSQL_DATABASE})
+            result = connection.execute(_introspection_query("schema"))
             schema_info = result.fetchall()
 
         schema_dict = {}
@@ -109,6 +240,6 @@ def get_schema():
 if __name__ == "__main__":
     test_connection()
     print("Databases:", list_databases())
-    if MYSQL_DATABASE:
+    if MYSQL_DATABASE or DB_DIALECT != "mysql":
         print("Tables:", list_tables(MYSQL_DATABASE))
         print("Schema:", get_schema())
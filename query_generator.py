@@ -1,10 +1,12 @@
 import os
 import re
-import mysql.connector
 import logging
 from groq import Groq
 from dotenv import load_dotenv
-from database import get_schema  # assumes your database.py defines get_schema()
+from contextlib import closing
+from sqlalchemy import column, func, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from database import get_schema, get_engine, DB_DIALECT  # assumes your database.py defines get_schema()
 
 
 # ---------------------- ENVIRONMENT SETUP ----------------------
@@ -18,6 +20,53 @@ print("🔍 MYSQL_PASSWORD:", os.getenv("MYSQL_PASSWORD"))
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Rows pulled per round trip when streaming SELECT results
+FETCH_BATCH_SIZE = int(os.getenv("FETCH_BATCH_SIZE", "1000"))
+
+# Rows returned by /execute_sql/; use /stream_sql/ to export full results
+MAX_RESULT_ROWS = int(os.getenv("MAX_RESULT_ROWS", "1000"))
+
+# Execution modes: commit as usual, roll back to report row counts, or reject DML
+EXECUTION_MODES = ("commit", "dry_run", "read_only")
+SQL_READ_ONLY = os.getenv("SQL_READ_ONLY", "false").lower() in ("1", "true", "yes")
+
+# Maximum rows folded into one multi-row INSERT when batching scripts
+BULK_INSERT_BATCH_SIZE = int(os.getenv("BULK_INSERT_BATCH_SIZE", "500"))
+
+# Dialect name and syntax hints injected into the generation prompt
+DIALECT_HINTS = {
+    "mysql": ("MySQL", "Quote identifiers with backticks and use LIMIT for row limits."),
+    "sqlite": ("SQLite", "Use LIMIT for row limits, strftime() for date parts, and no SHOW or RIGHT JOIN statements."),
+    "postgresql": ("PostgreSQL", "Quote identifiers with double quotes, use LIMIT/OFFSET and ILIKE for case-insensitive matching."),
+    "mssql": ("SQL Server", "Use T-SQL: SELECT TOP n instead of LIMIT and square brackets for identifiers."),
+    "snowflake": ("Snowflake", "Use LIMIT for row limits; unquoted identifiers are upper-case."),
+}
+
+# EXPLAIN prefix per dialect, used for optimisation tips
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN",
+    "mssql": None,
+}
+
+
+def get_dialect_hint():
+    """Return (dialect display name, syntax hint) for the active dialect."""
+    return DIALECT_HINTS.get(DB_DIALECT, DIALECT_HINTS["mysql"])
+
+
+def _engine_for_config(db_config: dict):
+    """Return the pooled engine matching an execution db_config."""
+    return get_engine(db_config=db_config or {})
+
+
+def _raw(conn):
+    """
+    Connection option for running user SQL verbatim: the driver gets no parameter
+    tuple, so '%' in literals is never treated as a format placeholder.
+    """
+    return conn.execution_options(no_parameters=True)
+
+
 # ---------------------- 1. CLEAN SQL OUTPUT ----------------------
 def clean_sql_output(response_text: str) -> str:
     """
@@ -53,19 +102,20 @@ def validate_sql_query(sql_query: str):
 # ---------------------- 3. GENERATE SQL USING GROQ ----------------------
 def generate_sql_query(n1_query: str) -> str:
     """
-    Converts a natural language query into an optimized MySQL query using Groq API.
-    Uses schema info for accuracy.
+    Converts a natural language query into an optimized SQL query using Groq API.
+    Uses schema info and the active dialect for accuracy.
     """
     try:
         schema = get_schema()
         schema_text = "\n".join([f"{table}: {', '.join(columns)}" for table, columns in schema.items()])
+        dialect_name, dialect_hint = get_dialect_hint()
 
         prompt = f"""
-        You are an expert MySQL query generator.
+        You are an expert {dialect_name} query generator.
         Convert the following natural language query into an optimized SQL statement.
 
         Rules:
-        - Use correct MySQL syntax.
+        - Use correct {dialect_name} syntax. {dialect_hint}
         - Use JOINs, GROUP BY, and indexes efficiently.
         - Return ONLY the SQL query — no explanation or comments.
         - End with a semicolon.
@@ -79,7 +129,7 @@ def generate_sql_query(n1_query: str) -> str:
         response = client.chat.completions.create(
             model="llama-3.3-70b-versatile",
             messages=[
-                {"role": "system", "content": "You are a MySQL expert."},
+                {"role": "system", "content": f"You are a {dialect_name} expert."},
                 {"role": "user", "content": prompt}
             ],
             temperature=0.1
@@ -99,57 +149,308 @@ def suggest_index(sql_query: str, db_config: dict) -> str:
     """
     Runs EXPLAIN on the query to suggest potential indexing improvements.
     """
+    prefix = EXPLAIN_PREFIXES.get(DB_DIALECT, "EXPLAIN")
+    if prefix is None:
+        return "Execution plans are not available for this database dialect."
     try:
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor()
-        cursor.execute(f"EXPLAIN {sql_query}")
-        plan = cursor.fetchall()
+        with _engine_for_config(db_config).connect() as conn:
+            plan = _raw(conn).exec_driver_sql(f"{prefix} {sql_query.strip().rstrip(';')}").fetchall()
         print("\nQuery Execution Plan:")
         for row in plan:
-            print(row)
-        cursor.close()
-        conn.close()
+            print(tuple(row))
         return "Consider adding indexes on columns used in WHERE, JOIN, or ORDER BY clauses."
     except Exception as e:
         return f"Could not generate execution plan: {e}"
 
 
 # ---------------------- 5. EXECUTE SQL QUERY ----------------------
-def execute_query(sql_query: str, db_config: dict):
+def stream_query(sql_query: str, db_config: dict, batch_size: int = FETCH_BATCH_SIZE):
+    """
+    Streams rows of a SELECT query in batches of dicts using a server-side cursor,
+    so large results are never buffered at once. MySQL runs on PyMySQL and
+    PostgreSQL on psycopg2, which both honour stream_results; SQLite reads rows
+    lazily from the file anyway.
+    """
+    with _engine_for_config(db_config).connect() as conn:
+        result = _raw(conn).execution_options(stream_results=True).exec_driver_sql(sql_query)
+        rows = result.mappings()
+        while True:
+            batch = rows.fetchmany(batch_size)
+            if not batch:
+                break
+            yield [dict(row) for row in batch]
+
+
+def split_sql_statements(sql_script: str, dialect: str = None) -> list:
+    """
+    Splits a script on semicolons outside quoted strings, identifiers and comments.
+    Comments are dropped from the returned statements; backslash escapes inside
+    quotes and '#' line comments are honoured for MySQL only.
+    """
+    dialect = dialect or DB_DIALECT
+    is_mysql = dialect == "mysql"
+    statements, current, quote = [], [], None
+    i, n = 0, len(sql_script)
+
+    def flush():
+        stmt = "".join(current).strip()
+        if stmt:
+            statements.append(stmt)
+        current.clear()
+
+    while i < n:
+        ch = sql_script[i]
+        nxt = sql_script[i + 1] if i + 1 < n else ""
+        if quote:
+            current.append(ch)
+            if is_mysql and ch == "\\" and quote != "`":
+                current.append(nxt)
+                i += 2
+                continue
+            if ch == quote:
+                quote = None
+            i += 1
+            continue
+        if (ch == "-" and nxt == "-") or (ch == "#" and is_mysql):
+            end = sql_script.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        if ch == "/" and nxt == "*":
+            end = sql_script.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            current.append(" ")
+            continue
+        if ch in ("'", '"', "`"):
+            quote = ch
+        if ch == ";":
+            flush()
+        else:
+            current.append(ch)
+        i += 1
+
+    flush()
+    return statements
+
+
+def _is_read_statement(statement: str) -> bool:
+    return statement.strip().lower().startswith(("select", "explain"))
+
+
+_INSERT_VALUES_RE = re.compile(r"^(insert\s+into\s+\S+\s*(?:\([^)]*\))?\s*values)\s*(\(.*\))$", re.I | re.S)
+
+
+def batch_insert_statements(statements: list) -> list:
+    """
+    Folds consecutive single-table INSERT ... VALUES statements with the same
+    column list into multi-row INSERTs of up to BULK_INSERT_BATCH_SIZE rows.
+    """
+    batched, group_prefix, group_rows = [], None, []
+
+    def flush():
+        for i in range(0, len(group_rows), BULK_INSERT_BATCH_SIZE):
+            batched.append(f"{group_prefix} " + ", ".join(group_rows[i:i + BULK_INSERT_BATCH_SIZE]))
+
+    for stmt in statements:
+        match = _INSERT_VALUES_RE.match(stmt)
+        if match and not re.search(r"\b(on\s+duplicate|on\s+conflict|returning)\b", stmt, re.I):
+            prefix = " ".join(match.group(1).split())
+            if group_prefix is not None and prefix.lower() == group_prefix.lower():
+                group_rows.append(match.group(2))
+                continue
+            if group_prefix is not None:
+                flush()
+            group_prefix, group_rows = prefix, [match.group(2)]
+            continue
+        if group_prefix is not None:
+            flush()
+            group_prefix, group_rows = None, []
+        batched.append(stmt)
+
+    if group_prefix is not None:
+        flush()
+    return batched
+
+
+def execute_script(sql_script: str, db_config: dict, mode: str = "commit", max_rows: int = None) -> dict:
+    """
+    Executes one or more statements inside a single transaction.
+    In dry_run mode the transaction is rolled back after reporting affected row counts;
+    in read_only mode any INSERT/UPDATE/DELETE is rejected before touching the database.
+    SELECTs return at most max_rows rows each, with a per-statement truncated flag.
+    """
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{mode}'. Use one of: {', '.join(EXECUTION_MODES)}.")
+    if SQL_READ_ONLY:
+        mode = "read_only"
+
+    statements = split_sql_statements(sql_script)
+    if not statements:
+        raise ValueError("No SQL statements to execute.")
+    for stmt in statements:
+        is_valid, error_msg = validate_sql_query(stmt + ";")
+        if not is_valid:
+            raise ValueError(f"{error_msg} Statement: {stmt}")
+        if mode == "read_only" and not _is_read_statement(stmt):
+            raise ValueError(f"Read-only mode rejects data modification. Statement: {stmt}")
+
+    batches = batch_insert_statements(statements)
+    logging.info(f"Executing {len(statements)} statement(s) as {len(batches)} batch(es) in {mode} mode")
+
+    statement_results, total_affected = [], 0
+    with _engine_for_config(db_config).connect() as conn:
+        trans = conn.begin()
+        try:
+            for stmt in batches:
+                # Reads use a server-side cursor so only the capped rows are pulled
+                options = {"stream_results": True} if _is_read_statement(stmt) else {}
+                result = _raw(conn).execution_options(**options).exec_driver_sql(stmt)
+                if result.returns_rows:
+                    rows = result.mappings()
+                    fetched = rows.fetchall() if max_rows is None else rows.fetchmany(max_rows + 1)
+                    result.close()
+                    truncated = max_rows is not None and len(fetched) > max_rows
+                    statement_results.append({
+                        "statement": stmt,
+                        "rows": [dict(row) for row in fetched[:max_rows]],
+                        "truncated": truncated,
+                    })
+                else:
+                    total_affected += max(result.rowcount, 0)
+                    statement_results.append({"statement": stmt, "rows_affected": result.rowcount})
+            if mode == "commit":
+                trans.commit()
+            else:
+                trans.rollback()
+        except Exception:
+            trans.rollback()
+            raise
+
+    return {
+        "mode": mode,
+        "committed": mode == "commit",
+        "statements": statement_results,
+        "total_rows_affected": total_affected,
+    }
+
+
+def execute_query(sql_query: str, db_config: dict, mode: str = "commit", max_rows: int = None):
     """
     Executes validated SQL query and returns results or error details.
+    Multi-statement scripts and non-commit modes run through execute_script().
+    SELECTs stop fetching once max_rows rows have been read.
     """
     is_valid, error_msg = validate_sql_query(sql_query)
     if not is_valid:
         logging.error(f"SQL Validation Error: {error_msg}")
         raise ValueError(error_msg)
 
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{mode}'. Use one of: {', '.join(EXECUTION_MODES)}.")
+
     try:
-        logging.info(f"Connecting to DB with config: {db_config}")
-        conn = mysql.connector.connect(**db_config)
-        cursor = conn.cursor(dictionary=True)
+        # Single SELECTs keep the streamed list response in every mode
+        statements = split_sql_statements(sql_query)
+        if len(statements) > 1 or (not _is_read_statement(sql_query) and (mode != "commit" or SQL_READ_ONLY)):
+            return execute_script(sql_query, db_config, mode, max_rows)
+
+        logging.info(f"Executing SQL on {DB_DIALECT}: {sql_query}")
+        if _is_read_statement(sql_query):
+            results = []
+            with closing(stream_query(sql_query, db_config)) as batches:
+                for batch in batches:
+                    results.extend(batch)
+                    if max_rows is not None and len(results) >= max_rows:
+                        break
+            return results if max_rows is None else results[:max_rows]
+
+        with _engine_for_config(db_config).begin() as conn:
+            result = _raw(conn).exec_driver_sql(sql_query)
+            return f"{result.rowcount} rows affected."
+
+    except SQLAlchemyError as e:
+        logging.error(f"Database Error: {e}")
+        raise Exception(f"Database Error: {e}")
+    except Exception as e:
+        logging.error(f"General Error executing query: {e}")
+        raise
 
-        logging.info(f"Executing SQL: {sql_query}")
-        cursor.execute(sql_query)
 
-        if sql_query.strip().lower().startswith("select"):
-            results = cursor.fetchall()
-        else:
-            conn.commit()
-            results = f"{cursor.rowcount} rows affected."
+# ---------------------- 6. AGGREGATE FOR VISUALIZATION ----------------------
+def _as_subquery(sql_query: str, name: str, *column_names):
+    """
+    Wraps a single SELECT as a Core subquery so each dialect renders its own LIMIT/TOP
+    and quoting; colons are escaped so literals like '10:30' are not read as bind params.
+    """
+    # The split statement has comments and the trailing semicolon removed
+    statements = split_sql_statements(sql_query)
+    if len(statements) != 1:
+        raise ValueError("Aggregation supports a single SELECT statement only.")
+    inner_query = statements[0]
+    if not inner_query.lower().startswith("select"):
+        raise ValueError("Only SELECT queries can be aggregated.")
+    escaped = re.sub(r"(?<!\\):", r"\\:", inner_query)
+    return text(escaped).columns(*[column(c) for c in column_names]).subquery(name)
+
+
+def get_query_columns(sql_query: str, db_config: dict) -> list:
+    """
+    Returns the column names of a SELECT without fetching any rows (LIMIT 0 probe).
+    """
+    probe = _as_subquery(sql_query, "probe")
+    try:
+        with _engine_for_config(db_config).connect() as conn:
+            result = conn.execute(select(text("*")).select_from(probe).limit(0))
+            return list(result.keys())
+    except SQLAlchemyError as e:
+        logging.error(f"Database Error: {e}")
+        raise Exception(f"Database Error: {e}")
+
+
+def aggregate_query(sql_query: str, column_name: str, db_config: dict, top_n: int = 10) -> dict:
+    """
+    Pushes the chart aggregation down to the database by wrapping the query as a subquery.
+    Returns the top-N buckets by count plus an "other" total for the remaining rows,
+    all from a single scan of the wrapped query.
+    """
+    if not column_name:
+        raise ValueError("A column to aggregate on is required.")
+    if top_n < 1:
+        raise ValueError("top_n must be at least 1.")
+
+    if column_name not in get_query_columns(sql_query, db_config):
+        raise ValueError(f"Column '{column_name}' is not in the query result.")
+
+    source = _as_subquery(sql_query, "agg_source", column_name)
+    try:
+        grouped = (
+            select(source.c[column_name].label("bucket"), func.count().label("count"))
+            .group_by(source.c[column_name])
+            .subquery("grouped")
+        )
+        # The window total is computed before LIMIT, so it covers every bucket
+        bucket_sql = (
+            select(grouped.c.bucket, grouped.c.count, func.sum(grouped.c.count).over().label("total"))
+            .order_by(grouped.c.count.desc())
+            .limit(top_n)
+        )
 
-        cursor.close()
-        conn.close()
-        return results
+        logging.info(f"Aggregating on {column_name} (top {top_n})")
+        with _engine_for_config(db_config).connect() as conn:
+            rows = conn.execute(bucket_sql).mappings().fetchall()
 
-    except mysql.connector.Error as e:
-        logging.error(f"MySQL Error: {e}")
-        raise Exception(f"MySQL Error: {e}")
+        buckets = [{"bucket": row["bucket"], "count": row["count"]} for row in rows]
+        total = int(rows[0]["total"]) if rows else 0
+        other = total - sum(row["count"] for row in buckets)
+        return {"column": column_name, "buckets": buckets, "other": other, "total": total}
+
+    except SQLAlchemyError as e:
+        logging.error(f"Database Error: {e}")
+        raise Exception(f"Database Error: {e}")
     except Exception as e:
-        logging.error(f"General Error executing query: {e}")
+        logging.error(f"General Error aggregating query: {e}")
         raise
 
-# ---------------------- 6. MAIN (LOCAL TESTING) ----------------------
+# ---------------------- 7. MAIN (LOCAL TESTING) ----------------------
 if __name__ == "__main__":
     db_config = {
     "host": os.getenv("MYSQL_HOST", "localhost"),
@@ -0,0 +1,31 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Run the whole pipeline against SQLite; these must be set before the modules are imported
+os.environ.pop("DATABASE_URL", None)
+os.environ["DB_DIALECT"] = "sqlite"
+os.environ["SQL_READ_ONLY"] = "false"
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database  # noqa: E402
+
+
+@pytest.fixture
+def db_config(tmp_path, monkeypatch):
+    """Temporary SQLite database with a small actor table, used for both execution and introspection."""
+    path = str(tmp_path / "test.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE actor (actor_id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT)")
+    conn.executemany(
+        "INSERT INTO actor (first_name, last_name) VALUES (?, ?)",
+        [("PENELOPE", "GUINESS"), ("NICK", "WAHLBERG"), ("ED", "CHASE"), ("JENNIFER", "DAVIS"), ("NICK", "SMITH")],
+    )
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(database, "SQLITE_PATH", path)
+    return {"path": path}
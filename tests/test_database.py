@@ -0,0 +1,47 @@
+import pytest
+
+import database
+
+
+def test_list_databases(db_config):
+    assert database.list_databases() == ["main"]
+
+
+def test_list_tables(db_config):
+    assert database.list_tables("main") == ["actor"]
+
+
+def test_list_columns(db_config):
+    assert database.list_columns("main", "actor") == ["actor_id", "first_name", "last_name"]
+
+
+def test_get_schema(db_config):
+    assert database.get_schema() == {
+        "actor": ["actor_id (INTEGER)", "first_name (TEXT)", "last_name (TEXT)"]
+    }
+
+
+def test_engine_is_reused(db_config):
+    assert database.get_engine(db_config=db_config) is database.get_engine(db_config=db_config)
+
+
+def test_mysql_url_uses_server_side_cursor_driver(monkeypatch):
+    monkeypatch.setattr(database, "DATABASE_URL", "")
+    monkeypatch.setattr(database, "DB_DIALECT", "mysql")
+    url = database._build_url(db_config={"host": "db", "user": "root", "password": "pw", "database": "sakila"})
+    assert url.drivername == "mysql+pymysql"
+    assert url.database == "sakila"
+    assert url.get_dialect()().supports_server_side_cursors is True
+
+
+def test_server_dialect_without_url_is_rejected(monkeypatch):
+    monkeypatch.setattr(database, "DATABASE_URL", "")
+    monkeypatch.setattr(database, "DB_DIALECT", "postgresql")
+    with pytest.raises(ValueError):
+        database._build_url()
+
+
+def test_database_url_wins_over_db_config(monkeypatch):
+    monkeypatch.setattr(database, "DATABASE_URL", "postgresql+psycopg2://u:p@h/mydb")
+    monkeypatch.setattr(database, "DB_DIALECT", "postgresql")
+    assert database._build_url(db_config={"database": "sakila"}).database == "mydb"
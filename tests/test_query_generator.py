@@ -0,0 +1,163 @@
+import pytest
+
+import query_generator as qg
+
+
+def count_actors(db_config):
+    return qg.execute_query("SELECT COUNT(*) AS n FROM actor;", db_config)[0]["n"]
+
+
+# ---------------------- EXECUTION ----------------------
+def test_select_returns_rows(db_config):
+    rows = qg.execute_query("SELECT first_name FROM actor ORDER BY actor_id;", db_config)
+    assert rows[0] == {"first_name": "PENELOPE"}
+    assert len(rows) == 5
+
+
+def test_select_stops_at_max_rows(db_config):
+    assert len(qg.execute_query("SELECT * FROM actor;", db_config, max_rows=2)) == 2
+
+
+def test_percent_literal_runs_without_parameters(db_config, monkeypatch):
+    engine = qg._engine_for_config(db_config)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("user SQL must not be sent with a parameter collection")
+
+    # Format-style drivers interpolate '%' whenever parameters are passed, even empty ones
+    monkeypatch.setattr(engine.dialect, "do_execute", fail)
+    rows = qg.execute_query("SELECT last_name FROM actor WHERE last_name LIKE '%SMITH%';", db_config)
+    assert rows == [{"last_name": "SMITH"}]
+    assert qg.execute_query("UPDATE actor SET last_name = '100%' WHERE actor_id = 1;", db_config) == "1 rows affected."
+
+
+def test_single_dml_commits(db_config):
+    assert qg.execute_query("DELETE FROM actor WHERE first_name = 'NICK';", db_config) == "2 rows affected."
+    assert count_actors(db_config) == 3
+
+
+def test_invalid_sql_is_rejected(db_config):
+    with pytest.raises(ValueError):
+        qg.execute_query("DROP TABLE actor;", db_config)
+
+
+# ---------------------- AGGREGATION ----------------------
+def test_aggregate_returns_top_buckets_and_other(db_config):
+    result = qg.aggregate_query("SELECT * FROM actor;", "first_name", db_config, top_n=1)
+    assert result["buckets"] == [{"bucket": "NICK", "count": 2}]
+    assert result["other"] == 3
+    assert result["total"] == 5
+
+
+def test_aggregate_keeps_colons_in_literals(db_config):
+    result = qg.aggregate_query("SELECT * FROM actor WHERE last_name <> ' :x';", "last_name", db_config, top_n=10)
+    assert result["total"] == 5
+
+
+def test_aggregate_empty_result(db_config):
+    result = qg.aggregate_query("SELECT * FROM actor WHERE actor_id < 0;", "first_name", db_config)
+    assert result == {"column": "first_name", "buckets": [], "other": 0, "total": 0}
+
+
+def test_aggregate_rejects_scripts(db_config):
+    with pytest.raises(ValueError):
+        qg.aggregate_query("SELECT * FROM actor; DELETE FROM actor;", "first_name", db_config)
+
+
+def test_get_query_columns(db_config):
+    assert qg.get_query_columns("SELECT actor_id, first_name AS name FROM actor;", db_config) == ["actor_id", "name"]
+
+
+def test_aggregate_ignores_trailing_comments(db_config):
+    query = "SELECT * FROM actor; -- note"
+    assert qg.get_query_columns(query, db_config) == ["actor_id", "first_name", "last_name"]
+    assert qg.aggregate_query(query, "first_name", db_config)["total"] == 5
+
+
+def test_aggregate_rejects_unknown_column(db_config):
+    with pytest.raises(ValueError):
+        qg.aggregate_query("SELECT first_name FROM actor;", "last_name", db_config)
+
+
+# ---------------------- SCRIPTS AND MODES ----------------------
+@pytest.mark.parametrize("script, dialect, expected", [
+    ("SELECT 1; SELECT 2;", "sqlite", ["SELECT 1", "SELECT 2"]),
+    ("SELECT 'a;b'; SELECT 2", "sqlite", ["SELECT 'a;b'", "SELECT 2"]),
+    ("SELECT 1; -- it's;\nSELECT 2;", "sqlite", ["SELECT 1", "SELECT 2"]),
+    ("SELECT /* ; */ 1;", "sqlite", ["SELECT   1"]),
+    ("SELECT 'a\\';b';", "mysql", ["SELECT 'a\\';b'"]),
+    ("SELECT 1; # note;\nSELECT 2", "mysql", ["SELECT 1", "SELECT 2"]),
+])
+def test_split_sql_statements(script, dialect, expected):
+    assert qg.split_sql_statements(script, dialect) == expected
+
+
+def test_batch_insert_statements_folds_consecutive_inserts(monkeypatch):
+    monkeypatch.setattr(qg, "BULK_INSERT_BATCH_SIZE", 2)
+    statements = [
+        "INSERT INTO actor (first_name) VALUES ('A')",
+        "insert into actor (first_name)  values ('B')",
+        "INSERT INTO actor (first_name) VALUES ('C')",
+        "UPDATE actor SET first_name = 'X'",
+        "INSERT INTO actor (first_name) VALUES ('D') ON CONFLICT DO NOTHING",
+    ]
+    assert qg.batch_insert_statements(statements) == [
+        "INSERT INTO actor (first_name) VALUES ('A'), ('B')",
+        "INSERT INTO actor (first_name) VALUES ('C')",
+        "UPDATE actor SET first_name = 'X'",
+        "INSERT INTO actor (first_name) VALUES ('D') ON CONFLICT DO NOTHING",
+    ]
+
+
+def test_script_commits_in_one_transaction(db_config):
+    script = "INSERT INTO actor (first_name) VALUES ('A'); INSERT INTO actor (first_name) VALUES ('B');"
+    summary = qg.execute_query(script, db_config)
+    assert summary["committed"] is True
+    assert summary["total_rows_affected"] == 2
+    assert len(summary["statements"]) == 1
+    assert count_actors(db_config) == 7
+
+
+def test_script_failure_rolls_back(db_config):
+    with pytest.raises(Exception):
+        qg.execute_query("DELETE FROM actor; INSERT INTO missing_table VALUES (1);", db_config)
+    assert count_actors(db_config) == 5
+
+
+def test_dry_run_reports_rows_and_rolls_back(db_config):
+    summary = qg.execute_query("DELETE FROM actor WHERE first_name = 'NICK';", db_config, "dry_run")
+    assert summary["committed"] is False
+    assert summary["total_rows_affected"] == 2
+    assert count_actors(db_config) == 5
+
+
+def test_read_only_rejects_dml(db_config):
+    with pytest.raises(ValueError):
+        qg.execute_query("DELETE FROM actor;", db_config, "read_only")
+    with pytest.raises(ValueError):
+        qg.execute_query("SELECT 1; -- harmless\nDELETE FROM actor;", db_config, "read_only")
+    assert count_actors(db_config) == 5
+
+
+def test_read_only_single_select_returns_rows(db_config):
+    assert qg.execute_query("SELECT COUNT(*) AS n FROM actor;", db_config, "read_only") == [{"n": 5}]
+
+
+def test_sql_read_only_env_forces_read_only(db_config, monkeypatch):
+    monkeypatch.setattr(qg, "SQL_READ_ONLY", True)
+    with pytest.raises(ValueError):
+        qg.execute_query("DELETE FROM actor;", db_config)
+
+
+def test_unknown_mode_is_rejected(db_config):
+    with pytest.raises(ValueError):
+        qg.execute_query("SELECT 1;", db_config, "yolo")
+
+
+
+def test_script_selects_respect_max_rows(db_config):
+    summary = qg.execute_query("SELECT * FROM actor; SELECT 1 AS one;", db_config, max_rows=2)
+    first, second = summary["statements"]
+    assert len(first["rows"]) == 2
+    assert first["truncated"] is True
+    assert second == {"statement": "SELECT 1 AS one", "rows": [{"one": 1}], "truncated": False}
@@ -4,6 +4,44 @@ import pandas as pd
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# Visualization calls are cached so reruns (e.g. toggling chart type) don't rescan the query
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_query_columns(query):
+    response = requests.post(f"{BASE_URL}/query_columns/", json={"query": query})
+    response.raise_for_status()
+    return response.json().get("columns", [])
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_aggregation(query, column, top_n):
+    response = requests.post(
+        f"{BASE_URL}/aggregate_sql/",
+        json={"query": query, "column": column, "top_n": top_n}
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def clear_visualization_cache():
+    """Drop cached columns and counts so charts reflect data changed by the last execution."""
+    fetch_query_columns.clear()
+    fetch_aggregation.clear()
+
+
+def render_script_summary(summary):
+    """Show the per-statement outcome of a script or dry run."""
+    verb = "committed" if summary["committed"] else "rolled back"
+    st.success(f"✅ Script {verb} ({summary['mode']}): {summary['total_rows_affected']} rows affected.")
+    for item in summary["statements"]:
+        st.code(item["statement"], language="sql")
+        if "rows" in item:
+            st.dataframe(pd.DataFrame(item["rows"]), use_container_width=True)
+            if item.get("truncated"):
+                st.caption("Showing the first rows only.")
+        else:
+            st.caption(f"{item['rows_affected']} rows affected")
+
+
 st.set_page_config(page_title="AI SQL Assistant", layout="wide")
 st.title("🧠 AI SQL Assistant (Groq + MySQL)")
 
@@ -143,30 +181,50 @@ with tab2:
         st.session_state.chart_type = "Pie Chart"
     if "load_query_flag" not in st.session_state:
         st.session_state.load_query_flag = False
+    if "history_query" not in st.session_state:
+        st.session_state.history_query = ""
+    if "history_mode" not in st.session_state:
+        st.session_state.history_mode = "dry_run"
 
     # ---------------- Query History Sidebar ----------------
     st.sidebar.subheader("🕘 Query History")
-    history_options = (
-        ["No previous queries"]
-        + [f"{ts} | {q}" for ts, q in st.session_state.query_history]
-        if st.session_state.query_history else ["No previous queries"]
+    history_options = ["No previous queries"] + [
+        f"{ts} | {mode} | {q}" for ts, q, mode in st.session_state.query_history
+    ]
+    selected_index = st.sidebar.selectbox(
+        "Select a past query to load:",
+        options=range(len(history_options)),
+        format_func=lambda i: history_options[i]
     )
-    selected_query = st.sidebar.selectbox("Select a past query to load:", options=history_options)
 
-    if st.sidebar.button("Load Query") and selected_query != "No previous queries":
-        st.session_state.last_query = selected_query.split(" | ", 1)[1]
+    if st.sidebar.button("Load Query") and selected_index > 0:
+        _, st.session_state.history_query, st.session_state.history_mode = (
+            st.session_state.query_history[selected_index - 1]
+        )
         st.session_state.load_query_flag = True
 
     # ---------------- Text Area ----------------
     if st.session_state.load_query_flag:
-        st.session_state.sql_input = st.session_state.last_query
+        history_query = st.session_state.history_query
+        # Reloads never commit: read-only runs stay read-only, everything else is dry-run
+        reload_mode = "read_only" if st.session_state.history_mode == "read_only" else "dry_run"
+        st.session_state.sql_input = history_query
         # Execute loaded query automatically
         try:
-            with st.spinner("Loading previous query results..."):
-                response = requests.post(f"{BASE_URL}/execute_sql/", json={"query": st.session_state.last_query})
+            with st.spinner(f"Loading previous query results ({reload_mode})..."):
+                response = requests.post(
+                    f"{BASE_URL}/execute_sql/",
+                    json={"query": history_query, "mode": reload_mode}
+                )
             if response.status_code == 200:
-                data = response.json().get("results", [])
-                st.session_state.last_results = data
+                clear_visualization_cache()
+                script = response.json().get("script")
+                if script:
+                    render_script_summary(script)
+                else:
+                    st.session_state.last_query = history_query
+                    st.session_state.last_results = response.json().get("results", [])
+                st.info(f"Reloaded query ran in {reload_mode} mode; execute it again to commit changes.")
             else:
                 st.error(f"❌ Error executing previous query: {response.text}")
         except Exception as e:
@@ -181,6 +239,13 @@ with tab2:
     )
     st.session_state.sql_input = sql_input
 
+    execution_mode = st.radio(
+        "Execution Mode",
+        ["commit", "dry_run", "read_only"],
+        horizontal=True,
+        help="dry_run rolls back after reporting affected rows; read_only rejects INSERT/UPDATE/DELETE."
+    )
+
     # ---------------- Execute SQL ----------------
     if st.button("Execute SQL Query"):
         if not sql_input.strip():
@@ -188,22 +253,30 @@ with tab2:
         else:
             try:
                 with st.spinner("Executing query..."):
-                    response = requests.post(f"{BASE_URL}/execute_sql/", json={"query": sql_input})
+                    response = requests.post(f"{BASE_URL}/execute_sql/", json={"query": sql_input, "mode": execution_mode})
                 if response.status_code == 200:
+                    clear_visualization_cache()
                     data = response.json().get("results", [])
+                    script = response.json().get("script")
                     tips = response.json().get("optimization_tips", "")
+                    if response.json().get("truncated"):
+                        st.warning("Showing the first rows only — use /stream_sql/ to export the full result.")
 
-                    st.session_state.last_query = sql_input
-                    st.session_state.last_results = data
+                    # Script summaries are not chartable results, so keep the previous query
+                    if not script:
+                        st.session_state.last_query = sql_input
+                        st.session_state.last_results = data
 
-                    # Add to history with timestamp
+                    # Add to history with timestamp and the mode it ran under
                     import datetime
                     timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    st.session_state.query_history.insert(0, (timestamp, sql_input))
+                    st.session_state.query_history.insert(0, (timestamp, sql_input, execution_mode))
                     if len(st.session_state.query_history) > 20:
                         st.session_state.query_history.pop()
 
-                    if data and isinstance(data, list) and isinstance(data[0], dict):
+                    if script:
+                        render_script_summary(script)
+                    elif data and isinstance(data, list) and isinstance(data[0], dict):
                         st.success("✅ Query executed successfully.")
                         df = pd.DataFrame(data)
                         st.dataframe(df, use_container_width=True)
@@ -235,27 +308,54 @@ with tab2:
             st.error(f"Error fetching explanation: {e}")
 
     # ---------------- Visualization ----------------
-    if st.checkbox("Show Pie Chart / Bar Graph for Last Result") and st.session_state.last_results:
-        df = pd.DataFrame(st.session_state.last_results)
+    # Only SELECT results can be charted; DML leaves last_query set for the explainer
+    last_is_select = st.session_state.last_query.strip().lower().startswith("select")
+    if st.checkbox("Show Pie Chart / Bar Graph for Last Result") and last_is_select:
         st.subheader("📊 Visualization")
 
-        if st.session_state.vis_column not in df.columns:
-            st.session_state.vis_column = df.columns[0]
-        column_to_plot = st.selectbox(
-            "Select Column for Visualization",
-            df.columns,
-            index=list(df.columns).index(st.session_state.vis_column)
-        )
-        st.session_state.vis_column = column_to_plot
+        # Column names come from a LIMIT 0 probe and counts are computed in the database,
+        # so the chart never needs the result rows themselves
+        try:
+            available_columns = fetch_query_columns(st.session_state.last_query)
+        except Exception as e:
+            available_columns = None
+            st.error(f"Error fetching result columns: {e}")
+
+        if available_columns:
+            if st.session_state.vis_column not in available_columns:
+                st.session_state.vis_column = available_columns[0]
+            column_to_plot = st.selectbox(
+                "Select Column for Visualization",
+                available_columns,
+                index=available_columns.index(st.session_state.vis_column)
+            )
+            st.session_state.vis_column = column_to_plot
+
+            chart_type = st.radio(
+                "Chart Type",
+                ["Pie Chart", "Bar Chart"],
+                index=0 if st.session_state.chart_type == "Pie Chart" else 1
+            )
+            st.session_state.chart_type = chart_type
+
+            top_n = st.number_input("Top N values", min_value=1, max_value=50, value=10)
 
-        chart_type = st.radio(
-            "Chart Type",
-            ["Pie Chart", "Bar Chart"],
-            index=0 if st.session_state.chart_type == "Pie Chart" else 1
-        )
-        st.session_state.chart_type = chart_type
+            try:
+                agg = fetch_aggregation(st.session_state.last_query, column_to_plot, int(top_n))
+                counts = pd.Series(
+                    {str(b["bucket"]): b["count"] for b in agg.get("buckets", [])},
+                    dtype="int64"
+                )
+                if agg.get("other", 0) > 0:
+                    counts["Other"] = agg["other"]
 
-        if chart_type == "Pie Chart":
-            st.pyplot(df[column_to_plot].value_counts().plot.pie(autopct='%1.1f%%').figure)
-        else:
-            st.bar_chart(df[column_to_plot].value_counts())
+                if counts.empty:
+                    st.info("No data to visualize.")
+                elif chart_type == "Pie Chart":
+                    st.pyplot(counts.plot.pie(autopct='%1.1f%%').figure)
+                else:
+                    st.bar_chart(counts)
+            except Exception as e:
+                st.error(f"Error fetching aggregation: {e}")
+        elif available_columns is not None:
+            st.info("Last result has no columns to visualize.")